@@ -1,15 +1,22 @@
+import base64
+import binascii
+import hashlib
+import hmac
+import json
 import os
-from datetime import datetime, timedelta, timezone
-from typing import Optional
+import threading
+import time
+from datetime import timedelta
+from typing import NamedTuple, Optional
 
 import jwt
+from cachetools import TTLCache
 from fastapi import HTTPException, Depends, status, Header
-from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from . import models, database
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM")
 if SECRET_KEY is None:
@@ -18,6 +25,44 @@ if SECRET_KEY is None:
 if ALGORITHM is None:
     raise ValueError("ALGORITHM must be set and cannot be None")
 
+# Built once rather than per decode; only exp and sub matter for our tokens
+DECODE_ALGORITHMS = [ALGORITHM]
+DECODE_OPTIONS = {"verify_aud": False, "verify_iss": False, "require": ["exp", "sub"]}
+
+BEARER_HEADERS = {"WWW-Authenticate": "Bearer"}
+# Raised as shared instances, only ever outside an except block so no __context__ is attached.
+# with_traceback(None) stops each raise from appending to the previous one's traceback; the
+# instance still holds the latest raise's traceback, so don't rely on it when logging.
+TOKEN_EXPIRED = HTTPException(status.HTTP_401_UNAUTHORIZED, "Token has expired", BEARER_HEADERS)
+INVALID_TOKEN_CLAIMS = HTTPException(status.HTTP_401_UNAUTHORIZED, "Invalid token claims", BEARER_HEADERS)
+INVALID_CREDENTIALS = HTTPException(status.HTTP_401_UNAUTHORIZED, "Invalid credentials", BEARER_HEADERS)
+INVALID_TOKEN_TYPE = HTTPException(status.HTTP_401_UNAUTHORIZED, "Invalid token type", BEARER_HEADERS)
+MALFORMED_AUTH_HEADER = HTTPException(status.HTTP_400_BAD_REQUEST, "Authorization header is malformed", BEARER_HEADERS)
+
+# default token lifetime in seconds
+TOKEN_TTL_SECONDS = 86400
+
+# HMAC keyed once at import; each HS256 verification works on a .copy() of it
+SECRET_KEY_BYTES = SECRET_KEY.encode("utf-8")
+HS256_MAC = hmac.new(SECRET_KEY_BYTES, digestmod=hashlib.sha256)
+
+
+class CurrentUser(NamedTuple):
+    """
+    Detached snapshot of the authenticated user's row.
+    """
+    id: int
+    email: str
+
+
+# email (JWT "sub") -> CurrentUser, saves a users lookup on every authenticated request
+user_cache = TTLCache(maxsize=10_000, ttl=60)
+user_cache_lock = threading.RLock()
+
+# raw token -> (exp as int, verified payload); exp is rechecked on every hit
+token_cache = TTLCache(maxsize=10_000, ttl=30)
+token_cache_lock = threading.RLock()
+
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
@@ -39,19 +84,102 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
             create_access_token({"sub": "user@example.com"})
         """
     to_encode = data.copy()
-    now = datetime.now(timezone.utc)
-    expire = now + expires_delta if expires_delta else now + timedelta(days=1)
-    to_encode.update({"exp": expire})
+    ttl = int(expires_delta.total_seconds()) if expires_delta else TOKEN_TTL_SECONDS
+    to_encode["exp"] = int(time.time()) + ttl
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
+def _b64url_decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def _claim_int(payload: dict, claim: str, error: type, message: str) -> int:
+    try:
+        return int(payload[claim])
+    except (ValueError, TypeError, OverflowError):
+        raise error(message)
+
+
+def verify_hs256(token: str) -> dict:
+    """
+    Verifies an HS256 JWT and returns its payload without going through PyJWT.
+
+    Mirrors the checks jwt.decode makes with DECODE_ALGORITHMS and
+    DECODE_OPTIONS: the header must be a JSON object naming HS256, the
+    signature must match, the payload must be a JSON object carrying the
+    required claims, iat/nbf/exp must be integers in range and sub/jti must
+    be strings. Headers we never issue (crit, b64) are rejected outright.
+    Failures raise the PyJWT exception jwt.decode would, so callers handle
+    both paths alike.
+
+    Args:
+        token (str): The JWT token to verify.
+
+    Returns:
+        dict: The decoded payload of the JWT token.
+
+    Raises:
+        jwt.PyJWTError: If the token is malformed, forged, expired or has an invalid claim.
+    """
+    try:
+        header_b64, payload_b64, signature_b64 = token.split(".")
+        signing_input = f"{header_b64}.{payload_b64}".encode("ascii")
+        header = json.loads(_b64url_decode(header_b64))
+        signature = _b64url_decode(signature_b64)
+    except (ValueError, RecursionError, binascii.Error):
+        raise jwt.DecodeError("Invalid token")
+    if not isinstance(header, dict):
+        raise jwt.DecodeError("Invalid header string: must be a json object")
+    if "kid" in header and not isinstance(header["kid"], str):
+        raise jwt.InvalidTokenError("Key ID header parameter must be a string")
+    if "crit" in header or "b64" in header:
+        raise jwt.InvalidTokenError("Unsupported critical extension")
+    if header.get("alg") != "HS256":
+        raise jwt.InvalidAlgorithmError("The specified alg value is not allowed")
+
+    mac = HS256_MAC.copy()
+    mac.update(signing_input)
+    if not hmac.compare_digest(mac.digest(), signature):
+        raise jwt.InvalidSignatureError("Signature verification failed")
+
+    try:
+        payload = json.loads(_b64url_decode(payload_b64))
+    except (ValueError, RecursionError, binascii.Error):
+        raise jwt.DecodeError("Invalid payload string")
+    if not isinstance(payload, dict):
+        raise jwt.DecodeError("Invalid payload string: must be a json object")
+    for claim in DECODE_OPTIONS["require"]:
+        if payload.get(claim) is None:
+            raise jwt.MissingRequiredClaimError(claim)
+
+    now = time.time()
+    if "iat" in payload:
+        iat = _claim_int(payload, "iat", jwt.InvalidIssuedAtError, "Issued At claim (iat) must be an integer.")
+        if iat > now:
+            raise jwt.ImmatureSignatureError("The token is not yet valid (iat)")
+    if "nbf" in payload:
+        nbf = _claim_int(payload, "nbf", jwt.DecodeError, "Not Before claim (nbf) must be an integer.")
+        if nbf > now:
+            raise jwt.ImmatureSignatureError("The token is not yet valid (nbf)")
+    exp = _claim_int(payload, "exp", jwt.DecodeError, "Expiration Time claim (exp) must be an integer.")
+    if exp <= now:
+        raise jwt.ExpiredSignatureError("Signature has expired")
+    if not isinstance(payload["sub"], str):
+        raise jwt.exceptions.InvalidSubjectError("Subject must be a string")
+    if "jti" in payload and not isinstance(payload["jti"], str):
+        raise jwt.exceptions.InvalidJTIError("JWT ID must be a string")
+    return payload
+
+
 def decode_jwt_token(token: str) -> dict:
     """
     Decodes a JWT token and extracts the payload.
 
     This function verifies the token's validity and decodes its payload.
-    It handles errors like expired or invalid tokens by raising HTTPExceptions.
+    Recently verified tokens are served from a short-lived cache as long as
+    they haven't expired. It handles errors like expired or invalid tokens
+    by raising HTTPExceptions.
 
     Args:
         token (str): The JWT token to decode.
@@ -62,82 +190,83 @@ def decode_jwt_token(token: str) -> dict:
     Raises:
         HTTPException: If the token is expired, invalid, or has an invalid claim.
     """
+    with token_cache_lock:
+        cached = token_cache.get(token)
+    if cached is not None and cached[0] > time.time():
+        return cached[1]
+
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        if ALGORITHM == "HS256":
+            payload = verify_hs256(token)
+        else:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=DECODE_ALGORITHMS, options=DECODE_OPTIONS, leeway=0)
+        with token_cache_lock:
+            # exp was validated with int() on both paths, but may be a numeric string
+            token_cache[token] = (int(payload["exp"]), payload)
         return payload
     except jwt.ExpiredSignatureError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token has expired",
-            headers={"WWW-Authenticate": "Bearer"}
-        )
+        error = TOKEN_EXPIRED
     except jwt.InvalidTokenError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token claims",
-            headers={"WWW-Authenticate": "Bearer"}
-        )
+        error = INVALID_TOKEN_CLAIMS
     except jwt.PyJWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid credentials",
-            headers={"WWW-Authenticate": "Bearer"}
-        )
+        error = INVALID_CREDENTIALS
+    # Raised here rather than in the handlers so the PyJWT error isn't chained onto the shared instance
+    raise error.with_traceback(None)
 
 
-def get_current_user(authorization: str = Header(...), db: Session = Depends(database.get_db)) -> models.User:
+async def get_current_user(authorization: str = Header(...),
+                           db: AsyncSession = Depends(database.get_db)) -> CurrentUser:
     """
         Retrieves the current user from the provided JWT token.
 
         This function extracts and validates the JWT token from the request's
         Authorization header. It then uses the decoded payload to look up
-        the corresponding user in the database.
+        the corresponding user, from a short-lived cache when possible and
+        otherwise in the database.
 
         Args:
             authorization (str): The Authorization header containing the JWT token.
-            db (Session): The database session to query the user.
+            db (AsyncSession): The database session to query the user.
 
         Returns:
-            models.User: The user associated with the provided token.
+            CurrentUser: The id and email of the user associated with the provided token.
 
         Raises:
             HTTPException: If the token is invalid, expired, or if the user is not found.
         """
+    parts = authorization.split(" ")
+    if len(parts) != 2:  # Handles cases where "Bearer <token>" is missing or malformed
+        raise MALFORMED_AUTH_HEADER.with_traceback(None)
+    token_prefix, token = parts
+
     try:
-        token_prefix, token = authorization.split(" ")
         if token_prefix != "Bearer":
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token type",
-                headers={"WWW-Authenticate": "Bearer"}
-            )
+            raise INVALID_TOKEN_TYPE.with_traceback(None)
 
         payload = decode_jwt_token(token)  # Decode and handle errors
         email: str = payload.get("sub")
 
         if email is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid credentials",
-                headers={"WWW-Authenticate": "Bearer"}
-            )
-
-        user = db.query(models.User).filter(models.User.email == email).first()
-        if user is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid credentials",
-                headers={"WWW-Authenticate": "Bearer"}
-            )
+            raise INVALID_CREDENTIALS.with_traceback(None)
+
+        with user_cache_lock:
+            user = user_cache.get(email)
+        if user is not None:
+            return user
+
+        row = (await db.execute(
+            select(models.User.id, models.User.email).where(models.User.email == email)
+        )).first()
+        if row is None:
+            raise INVALID_CREDENTIALS.with_traceback(None)
 
+        user = CurrentUser(id=row.id, email=row.email)
+        with user_cache_lock:
+            user_cache[email] = user
         return user
 
-    except ValueError:  # Handles cases where "Bearer <token>" is missing or malformed
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Authorization header is malformed",
-            headers={"WWW-Authenticate": "Bearer"}
-        )
+    except HTTPException:  # Already mapped above, don't turn it into a 500
+        raise
     except Exception as e:  # Catch any other unexpected errors
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
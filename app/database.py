@@ -1,8 +1,8 @@
 import os
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base
-from sqlalchemy.orm import sessionmaker
 
 # loads env variables from .env file
 load_dotenv()
@@ -11,25 +11,53 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if DATABASE_URL is None:
     raise ValueError("DATABASE_URL environment variable not set")
 
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# DATABASE_URL must name an async driver, e.g. mysql+aiomysql:// or postgresql+asyncpg://
+engine = create_async_engine(
+    DATABASE_URL,
+    pool_size=int(os.getenv("DB_POOL_SIZE", "20")),
+    max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "40")),
+    pool_pre_ping=True,
+    pool_recycle=1800,
+    pool_timeout=10,
+    echo=False,
+)
+SessionLocal = async_sessionmaker(bind=engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
 
 
-def get_db():
+async def get_db(request: Request) -> AsyncSession:
     """
-    Provides a database session for a request.
+    Provides the database session for a request.
 
     This function is used by FastAPI to inject a database session into
-    route handlers. The session is automatically closed after the request
-    is processed to free resources.
+    route handlers. The session is opened by the db_session_middleware in
+    app.main and stored on request.state, which also closes it once the
+    response has been produced.
 
-    Yields:
-        Session: A SQLAlchemy Session instance.
+    Args:
+        request (Request): The incoming request carrying the session.
+
+    Returns:
+        AsyncSession: A SQLAlchemy AsyncSession instance.
+    """
+    return request.state.db
+
+
+def detach_db(request: Request) -> AsyncSession:
+    """
+    Takes over the request's database session, leaving a fresh one in its place.
+
+    Used when a response body keeps reading from the session after the
+    handler returns: the middleware then closes the unused replacement,
+    and the caller becomes responsible for closing the returned session.
+
+    Args:
+        request (Request): The incoming request carrying the session.
+
+    Returns:
+        AsyncSession: The session that was attached to the request.
     """
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+    db = request.state.db
+    request.state.db = SessionLocal()
+    return db
@@ -1,9 +1,40 @@
-from fastapi import FastAPI
-from app.database import engine, Base
+import os
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse
+from app.database import engine, Base, SessionLocal
 from app.routers import posts, users
 
-Base.metadata.create_all(bind=engine)
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Skipped unless asked for, so warm deployments avoid the catalog queries; a new database
+    # needs one start with AUTO_CREATE_TABLES=1 before anything else works
+    if os.getenv("AUTO_CREATE_TABLES") == "1":
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    yield
+    await engine.dispose()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+
+
+@app.middleware("http")
+async def db_session_middleware(request: Request, call_next):
+    """
+    Opens one database session per request and closes it afterwards.
+
+    The session is lazy, so requests that never touch the database never
+    check out a pooled connection.
+    """
+    request.state.db = SessionLocal()
+    try:
+        return await call_next(request)
+    finally:
+        await request.state.db.close()
+
 
 app.include_router(users.router)
 app.include_router(posts.router)
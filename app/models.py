@@ -1,8 +1,26 @@
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import bcrypt
-from sqlalchemy import Column, Integer, String, Text, ForeignKey
+from cachetools import TTLCache
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
+# bcrypt cost factor, read once at import so hashing doesn't hit os.getenv per call
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# bcrypt releases the GIL while hashing, so a plain thread pool runs hashes in parallel
+# without tying up the event loop or FastAPI's shared threadpool
+BCRYPT_POOL = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="bcrypt")
+
+# (stored hash, sha256 of attempted password) -> checkpw result; never keyed by the plaintext.
+# Kept small and short-lived to bound how long a verified guess stays in memory.
+verify_cache = TTLCache(maxsize=10_000, ttl=30)
+verify_cache_lock = threading.RLock()
+
 
 class User(Base):
     __tablename__ = 'users'
@@ -13,23 +31,53 @@ class User(Base):
 
     posts = relationship("Post", back_populates="owner")
 
+    @classmethod
+    def hash_password(cls, password):
+        """
+        Hash a plaintext password with a fresh salt at BCRYPT_ROUNDS.
+        """
+        salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
     def set_password(self, password):
         """
         Hash and set the user's password with a salt.
         """
-        salt = bcrypt.gensalt(rounds=12)
-        hashed_password = bcrypt.hashpw(password.encode('utf-8'), salt)
-        self.hashed_password = hashed_password.decode('utf-8')
+        self.hashed_password = self.hash_password(password)
 
     def verify_password(self, password):
         """
         Verify the password against the stored hashed password.
+
+        Results are cached briefly so repeat logins skip a full bcrypt run.
+        """
+        password_bytes = password.encode('utf-8')
+        key = (self.hashed_password, hashlib.sha256(password_bytes).digest())
+        with verify_cache_lock:
+            result = verify_cache.get(key)
+        if result is None:
+            result = bcrypt.checkpw(password_bytes, self.hashed_password.encode('utf-8'))
+            with verify_cache_lock:
+                verify_cache[key] = result
+        return result
+
+    def needs_rehash(self):
+        """
+        Check whether the stored hash was made with fewer rounds than BCRYPT_ROUNDS.
+
+        Hashes look like "$2b$12$<salt+digest>", so the cost is the third
+        "$"-separated field.
         """
-        return bcrypt.checkpw(password.encode('utf-8'), self.hashed_password.encode('utf-8'))
+        try:
+            return int(self.hashed_password.split('$')[2]) < BCRYPT_ROUNDS
+        except (AttributeError, IndexError, ValueError):
+            return True
 
 
 class Post(Base):
     __tablename__ = 'posts'
+    # (user_id, id) serves read_posts' per-user lookups and plain user_id filters alike
+    __table_args__ = (Index("ix_posts_user_id_id", "user_id", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -1,19 +1,44 @@
+import threading
 from typing import List
 
+import orjson
 from cachetools import TTLCache
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import schemas, models, auth, database
 
 router = APIRouter(prefix="/posts", tags=["posts"])
+# user id -> serialized JSON of that user's posts
 cache = TTLCache(maxsize=1000, ttl=300)
+# TTLCache isn't thread-safe; the lock is never held across an await
+cache_lock = threading.RLock()
+# user id -> [reads in flight, writes since the first of them started]; a read only fills the
+# cache if the write count hasn't moved, and the entry is dropped once no read is in flight
+cache_generations = {}
+# post lists larger than this are streamed and never cached
+CACHE_MAX_BYTES = 64 * 1024
+
+
+def invalidate_posts_cache(user_id: int):
+    """
+    Drops a user's cached posts and stops in-flight reads from caching stale data.
+
+    Args:
+        user_id (int): The ID of the user whose posts changed.
+    """
+    with cache_lock:
+        cache.pop(user_id, None)
+        entry = cache_generations.get(user_id)
+        if entry is not None:
+            entry[1] += 1
 
 
 @router.post("/", response_model=schemas.PostResponse, status_code=status.HTTP_201_CREATED)
-@router.post("/", response_model=schemas.PostResponse, status_code=status.HTTP_201_CREATED)
-def create_post(request: schemas.PostRequest, current_user: models.User = Depends(auth.get_current_user),
-                db: Session = Depends(database.get_db)):
+async def create_post(request: schemas.PostRequest, current_user: auth.CurrentUser = Depends(auth.get_current_user),
+                      db: AsyncSession = Depends(database.get_db)):
     """
     Creates a new post for the current user.
 
@@ -24,8 +49,8 @@ def create_post(request: schemas.PostRequest, current_user: models.User = Depend
 
     Args:
         request (schemas.PostRequest): The request data containing the text of the post.
-        current_user (models.User): The currently authenticated user making the post.
-        db (Session): The database session used to interact with the database.
+        current_user (auth.CurrentUser): The currently authenticated user making the post.
+        db (AsyncSession): The database session used to interact with the database.
 
     Returns:
         models.Post: The newly created post.
@@ -35,42 +60,103 @@ def create_post(request: schemas.PostRequest, current_user: models.User = Depend
     """
     post = models.Post(text=request.text, user_id=current_user.id)
     db.add(post)
-    db.commit()
-    db.refresh(post)
-    cache.pop(current_user.email, None)
+    await db.commit()
+    await db.refresh(post)
+    invalidate_posts_cache(current_user.id)
     return post
 
 
+async def stream_posts(db: AsyncSession, rows, head: List[bytes]):
+    """
+    Streams the rest of a user's posts as a JSON array, one row at a time.
+
+    The rows come from a server-side cursor that read_posts has already
+    started; head holds the rows it serialized before deciding to stream.
+    Nothing is kept once it has been sent, and the result is not cached.
+
+    Args:
+        db (AsyncSession): The session owning the cursor, closed when the stream ends.
+        rows (AsyncResult): The partially consumed (id, text) rows.
+        head (List[bytes]): The already serialized leading rows.
+
+    Yields:
+        bytes: Consecutive pieces of the JSON array.
+    """
+    try:
+        yield b"[" + b",".join(head)
+        del head[:]
+        async for row in rows:
+            yield b"," + orjson.dumps({"id": row.id, "text": row.text})
+        yield b"]"
+    finally:
+        await db.close()
+
+
 @router.get("/", response_model=List[schemas.PostResponse])
-def read_posts(current_user: models.User = Depends(auth.get_current_user), db: Session = Depends(database.get_db)):
+async def read_posts(request: Request, current_user: auth.CurrentUser = Depends(auth.get_current_user),
+                     db: AsyncSession = Depends(database.get_db)):
     """
         Retrieves all posts of the current authenticated user.
 
         This function checks if the user's posts are cached. If they are not
-        in the cache, it queries the database for all posts belonging to the
-        authenticated user, caches the posts for 5 minutes, and then returns
-        them.
+        in the cache, it reads them through a server-side cursor in batches
+        of 100. Lists up to CACHE_MAX_BYTES are returned in one response and
+        cached for 5 minutes, unless a post was created or deleted meanwhile;
+        larger ones are streamed as a chunked JSON array without caching.
+        Both cases use the request's session, so a read never holds more than
+        one pooled connection.
 
         Args:
-            current_user (models.User): The currently authenticated user whose posts are to be retrieved.
-            db (Session): The database session used to interact with the database.
+            request (Request): The incoming request, whose session a streamed response takes over.
+            current_user (auth.CurrentUser): The currently authenticated user whose posts are to be retrieved.
+            db (AsyncSession): The database session used to interact with the database.
 
         Returns:
-            List[models.Post]: A list of posts belonging to the current user.
+            Response: A JSON list of posts belonging to the current user.
 
         Raises:
             HTTPException: If the user is not authenticated (handled by Depends).
         """
-    if current_user.email in cache:
-        return cache[current_user.email]
-    posts = db.query(models.Post).filter(models.Post.user_id == int(current_user.id)).all()
-    cache[current_user.email] = posts
-    return posts
+    user_id = current_user.id
+    with cache_lock:
+        content = cache.get(user_id)
+        if content is not None:
+            return Response(content=content, media_type="application/json")
+        entry = cache_generations.setdefault(user_id, [0, 0])
+        entry[0] += 1
+        generation = entry[1]
+
+    try:
+        rows = await db.stream(
+            select(models.Post.id, models.Post.text)
+            .where(models.Post.user_id == user_id)
+            .execution_options(yield_per=100)
+        )
+        parts = []
+        size = 0
+        async for row in rows:
+            part = orjson.dumps({"id": row.id, "text": row.text})
+            parts.append(part)
+            size += len(part)
+            if size > CACHE_MAX_BYTES:
+                # The body outlives this handler, so the stream takes the session with it
+                return StreamingResponse(stream_posts(database.detach_db(request), rows, parts),
+                                         media_type="application/json")
+        content = b"[" + b",".join(parts) + b"]"
+        with cache_lock:
+            if entry[1] == generation:
+                cache[user_id] = content
+        return Response(content=content, media_type="application/json")
+    finally:
+        with cache_lock:
+            entry[0] -= 1
+            if entry[0] == 0:
+                del cache_generations[user_id]
 
 
 @router.delete("/{post_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_post(post_id: int, current_user: models.User = Depends(auth.get_current_user),
-                db: Session = Depends(database.get_db)):
+async def delete_post(post_id: int, current_user: auth.CurrentUser = Depends(auth.get_current_user),
+                      db: AsyncSession = Depends(database.get_db)):
     """
         Deletes a post belonging to the current user.
 
@@ -81,8 +167,8 @@ def delete_post(post_id: int, current_user: models.User = Depends(auth.get_curre
 
         Args:
             post_id (int): The ID of the post to be deleted.
-            current_user (models.User): The currently authenticated user who owns the post.
-            db (Session): The database session used to interact with the database.
+            current_user (auth.CurrentUser): The currently authenticated user who owns the post.
+            db (AsyncSession): The database session used to interact with the database.
 
         Returns:
             None: The post is deleted and the response code is 204 (No Content).
@@ -90,9 +176,9 @@ def delete_post(post_id: int, current_user: models.User = Depends(auth.get_curre
         Raises:
             HTTPException: If the post is not found or if it doesn't belong to the authenticated user.
         """
-    post = db.query(models.Post).filter(models.Post.id == post_id, models.Post.user_id == current_user.id).first()
+    post = await db.scalar(select(models.Post).where(models.Post.id == post_id, models.Post.user_id == current_user.id))
     if not post:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
-    db.delete(post)
-    db.commit()
-    cache.pop(current_user.email, None)
+    await db.delete(post)
+    await db.commit()
+    invalidate_posts_cache(current_user.id)
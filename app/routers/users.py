@@ -1,27 +1,30 @@
+import asyncio
 from datetime import timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import schemas, auth, database
-from app.models import User
+from app.models import User, BCRYPT_POOL
 
 router = APIRouter(tags=["users"])
 
 
 @router.post("/signup", response_model=schemas.TokenResponse, status_code=status.HTTP_201_CREATED)
-def signup(request: schemas.SignupRequest, db: Session = Depends(database.get_db)):
+async def signup(request: schemas.SignupRequest, db: AsyncSession = Depends(database.get_db)):
     """
     Registers a new user and returns an access token.
 
-    This function checks if the email is already registered. If not, it
-    hashes the password and creates a new user in the database. It then
-    generates a JWT access token that expires in 1 hour and returns it to
-    the user.
+    This function hashes the password and inserts the new user in a single
+    statement, relying on the unique index on email to reject addresses
+    that are already registered. It then generates a JWT access token that
+    expires in 1 hour and returns it to the user.
 
     Args:
         request (schemas.SignupRequest): The request data containing the user's email and password.
-        db (Session): The database session to interact with the database.
+        db (AsyncSession): The database session to interact with the database.
 
     Returns:
         dict: A dictionary containing the JWT access token and token type.
@@ -29,18 +32,17 @@ def signup(request: schemas.SignupRequest, db: Session = Depends(database.get_db
     Raises:
         HTTPException: If the email is already registered or an error occurs during the signup process.
     """
-    existing_user = db.query(User).filter(User.email == request.email).first()
-    if existing_user:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
-
-    hashed_password = auth.pwd_context.hash(request.password)
+    loop = asyncio.get_running_loop()
+    hashed_password = await loop.run_in_executor(BCRYPT_POOL, User.hash_password, request.password)
     user = User(email=request.email, hashed_password=hashed_password)
     db.add(user)
     try:
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Error during signup process")
 
     access_token = auth.create_access_token(data={"sub": user.email}, expires_delta=timedelta(hours=1))
@@ -48,7 +50,7 @@ def signup(request: schemas.SignupRequest, db: Session = Depends(database.get_db
 
 
 @router.post("/login", response_model=schemas.TokenResponse)
-def login(request: schemas.LoginRequest, db: Session = Depends(database.get_db)):
+async def login(request: schemas.LoginRequest, db: AsyncSession = Depends(database.get_db)):
     """
         Authenticates the user and returns an access token.
 
@@ -58,7 +60,7 @@ def login(request: schemas.LoginRequest, db: Session = Depends(database.get_db))
 
         Args:
             request (schemas.LoginRequest): The request data containing email and password.
-            db (Session): The database session to query the user.
+            db (AsyncSession): The database session to query the user.
 
         Returns:
             dict: A dictionary containing the JWT access token and token type.
@@ -66,10 +68,20 @@ def login(request: schemas.LoginRequest, db: Session = Depends(database.get_db))
         Raises:
             HTTPException: If the credentials are invalid.
         """
-    user = db.query(User).filter(User.email == request.email).first()
-    if not user or not user.verify_password(request.password):
+    user = await db.scalar(select(User).where(User.email == request.email))
+    loop = asyncio.get_running_loop()
+    if not user or not await loop.run_in_executor(BCRYPT_POOL, user.verify_password, request.password):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials",
                             headers={"WWW-Authenticate": "Bearer"})
 
+    # Upgrade hashes made with an older cost factor while we have the plaintext
+    if user.needs_rehash():
+        await loop.run_in_executor(BCRYPT_POOL, user.set_password, request.password)
+        db.add(user)
+        try:
+            await db.commit()
+        except Exception:
+            await db.rollback()
+
     access_token = auth.create_access_token(data={"sub": user.email}, expires_delta=timedelta(hours=1))
     return {"access_token": access_token, "token_type": "bearer"}
@@ -1,11 +1,15 @@
-from pydantic import BaseModel, EmailStr, constr
+from pydantic import BaseModel, constr
+
+# cheap shape check compiled once by pydantic-core, instead of email-validator's per-call normalization
+EMAIL_RE = r"^[^@\s]+@[^@\s]+\.[^@\s]+$"
+Email = constr(pattern=EMAIL_RE, max_length=254)
 
 class SignupRequest(BaseModel):
-    email: EmailStr
+    email: Email
     password: constr(min_length=8)
 
 class LoginRequest(BaseModel):
-    email: EmailStr
+    email: Email
     password: str
 
 class PostRequest(BaseModel):
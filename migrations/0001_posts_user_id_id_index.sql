@@ -0,0 +1,3 @@
+-- Composite index behind read_posts' per-user lookup (models.Post.__table_args__).
+-- create_all only adds it to new tables; run this once on databases created before it.
+CREATE INDEX ix_posts_user_id_id ON posts (user_id, id);
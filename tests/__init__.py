@@ -0,0 +1,12 @@
+import os
+import tempfile
+
+# Must run before app modules are imported; they read configuration at import time
+os.environ.setdefault("SECRET_KEY", "test-secret-key-that-is-at-least-32-bytes")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/test.db")
+os.environ.setdefault("AUTO_CREATE_TABLES", "1")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+# A single pooled connection makes any request that checks out two time out instead of passing
+os.environ.setdefault("DB_POOL_SIZE", "1")
+os.environ.setdefault("DB_MAX_OVERFLOW", "0")
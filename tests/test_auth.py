@@ -0,0 +1,74 @@
+import base64
+import json
+import time
+import unittest
+
+import jwt
+
+from app import auth
+
+
+def _segment(data) -> str:
+    raw = data if isinstance(data, bytes) else json.dumps(data).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+class VerifyHS256Test(unittest.TestCase):
+    """
+    verify_hs256 must accept and reject exactly what jwt.decode does with the same options.
+    """
+
+    def encode(self, payload, key=None, algorithm="HS256", headers=None):
+        return jwt.encode(payload, key or auth.SECRET_KEY, algorithm=algorithm, headers=headers)
+
+    def assert_matches_pyjwt(self, token):
+        try:
+            expected = jwt.decode(token, auth.SECRET_KEY, algorithms=auth.DECODE_ALGORITHMS,
+                                  options=auth.DECODE_OPTIONS, leeway=0)
+        except jwt.PyJWTError as e:
+            with self.assertRaises(jwt.PyJWTError, msg=f"PyJWT rejected it with {e!r}"):
+                auth.verify_hs256(token)
+        else:
+            self.assertEqual(auth.verify_hs256(token), expected)
+
+    def test_valid(self):
+        now = int(time.time())
+        self.assert_matches_pyjwt(self.encode({"sub": "a@b.co", "exp": now + 60}))
+        self.assert_matches_pyjwt(self.encode({"sub": "a@b.co", "exp": now + 60, "iat": now, "nbf": now}))
+
+    def test_forged(self):
+        token = self.encode({"sub": "a@b.co", "exp": int(time.time()) + 60}, key="another-key-that-is-also-32-bytes-long")
+        self.assert_matches_pyjwt(token)
+        header, payload, _ = self.encode({"sub": "a@b.co", "exp": int(time.time()) + 60}).split(".")
+        tampered = _segment({"sub": "admin@b.co", "exp": int(time.time()) + 60})
+        self.assert_matches_pyjwt(f"{header}.{tampered}.{_}")
+
+    def test_expired(self):
+        self.assert_matches_pyjwt(self.encode({"sub": "a@b.co", "exp": int(time.time()) - 1}))
+
+    def test_alg_swapped(self):
+        payload = {"sub": "a@b.co", "exp": int(time.time()) + 60}
+        self.assert_matches_pyjwt(self.encode(payload, algorithm="HS512"))
+        self.assert_matches_pyjwt(f"{_segment({'alg': 'none', 'typ': 'JWT'})}.{_segment(payload)}.")
+
+    def test_malformed(self):
+        valid = self.encode({"sub": "a@b.co", "exp": int(time.time()) + 60})
+        for token in ["", "abc", "a.b", "a.b.c", "a.b.c.d", valid + "x.y", valid.replace(".", "!", 1),
+                      f"{_segment(b'not json')}.{_segment({})}.c", f"{_segment([1])}.{_segment({})}.c"]:
+            with self.subTest(token=token):
+                self.assert_matches_pyjwt(token)
+
+    def test_claims(self):
+        now = int(time.time())
+        for payload in [{"exp": now + 60}, {"sub": "a@b.co"}, {"sub": None, "exp": now + 60},
+                        {"sub": ["a@b.co"], "exp": now + 60}, {"sub": "a@b.co", "exp": "soon"},
+                        {"sub": "a@b.co", "exp": now + 60, "iat": "then"},
+                        {"sub": "a@b.co", "exp": now + 60, "iat": now + 3600},
+                        {"sub": "a@b.co", "exp": now + 60, "nbf": now + 3600},
+                        {"sub": "a@b.co", "exp": now + 60, "jti": 1}]:
+            with self.subTest(payload=payload):
+                self.assert_matches_pyjwt(self.encode(payload))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import json
+import unittest
+
+from fastapi.testclient import TestClient
+
+from app import auth
+from app.main import app
+from app.routers import posts
+
+
+class ReadPostsTest(unittest.TestCase):
+    """
+    read_posts caching, streaming and invalidation, on a single pooled connection.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.client = TestClient(app).__enter__()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.client.__exit__(None, None, None)
+
+    def setUp(self):
+        posts.cache.clear()
+        auth.user_cache.clear()
+        email = f"user{self.id().rsplit('.', 1)[-1]}@example.com"
+        response = self.client.post("/signup", json={"email": email, "password": "password1"})
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        self.client.get("/posts/", headers=self.headers)  # resolves the user into auth.user_cache
+        self.user_id = auth.user_cache[email].id
+        posts.cache.clear()
+
+    def create(self, text):
+        return self.client.post("/posts/", json={"text": text}, headers=self.headers).json()
+
+    def read(self):
+        response = self.client.get("/posts/", headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.content)
+
+    def test_small_list_is_cached(self):
+        self.create("hello")
+        self.create("world")
+        self.assertEqual([post["text"] for post in self.read()], ["hello", "world"])
+        self.assertIn(self.user_id, posts.cache)
+        self.assertEqual(json.loads(posts.cache[self.user_id]), self.read())
+        self.assertEqual(posts.cache_generations, {})
+
+    def test_large_list_is_streamed_and_not_cached(self):
+        created = [self.create("x" * 20_000) for _ in range(5)]
+        self.assertEqual(self.read(), created)
+        self.assertNotIn(self.user_id, posts.cache)
+        self.assertEqual(posts.cache_generations, {})
+
+    def test_write_during_read_is_not_cached(self):
+        self.create("old")
+        dumps = posts.orjson.dumps
+
+        def dumps_then_write(obj):
+            posts.invalidate_posts_cache(self.user_id)
+            return dumps(obj)
+
+        posts.orjson.dumps = dumps_then_write
+        try:
+            self.read()
+        finally:
+            posts.orjson.dumps = dumps
+        self.assertNotIn(self.user_id, posts.cache)
+        self.assertEqual(posts.cache_generations, {})
+
+    def test_writes_invalidate_cache(self):
+        first = self.create("first")
+        self.read()
+        self.create("second")
+        self.assertEqual([post["text"] for post in self.read()], ["first", "second"])
+        self.client.delete(f"/posts/{first['id']}", headers=self.headers)
+        self.assertEqual([post["text"] for post in self.read()], ["second"])
+
+
+if __name__ == "__main__":
+    unittest.main()